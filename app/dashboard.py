@@ -1,10 +1,14 @@
 import os
 import sys
+import hashlib
+from io import BytesIO
 # Add the parent directory to the sys.path so that 'src' can be found.
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 import streamlit as st
+import altair as alt
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import matplotlib.ticker as mtick
@@ -12,28 +16,153 @@ from matplotlib.colors import LinearSegmentedColormap
 
 # Import the ingestion and cleaning functions from the src folder
 from src.data_ingestion import ingest_spotify_zip
-from src.data_cleaning import clean_spotify_df
+from src.data_cleaning import clean_spotify_df, DAY_ORDER
+from src.aggregations import track_play_stats, fast_counts, top_k
 
 sns.set_style('whitegrid')
 
+# Cached frames are full copies of the history, so keep only a few and expire them
+@st.cache_data(show_spinner=False, max_entries=4, ttl=3600)
 def load_data_from_zip(zip_bytes):
     """
     Reads the ZIP file bytes, ingests the JSON data,
     cleans the DataFrame, and returns it.
+    Cached on the uploaded bytes so widget interactions don't re-parse the ZIP.
     """
     raw_df = ingest_spotify_zip(zip_bytes)
     if raw_df.empty:
         st.error("No JSON files found in the ZIP file.")
         return pd.DataFrame()
     cleaned_df = clean_spotify_df(raw_df)
-    # Ensure the timestamp column is tz-naive for comparisons
-    if 'ts' in cleaned_df.columns:
-        if pd.api.types.is_datetime64tz_dtype(cleaned_df['ts']):
-            cleaned_df['ts'] = cleaned_df['ts'].dt.tz_convert(None)
-        else:
-            cleaned_df['ts'] = pd.to_datetime(cleaned_df['ts'], errors='coerce')
     return cleaned_df
 
+# Each rerun goes through 3-4 filter stages, so allow a few reruns' worth of entries
+@st.cache_data(show_spinner=False, max_entries=16, ttl=3600)
+def filter_data(_df, data_key, threshold_ms, selected_years=(), start_date=None, end_date=None,
+                selected_artists=(), filter_mode="Include"):
+    """
+    Applies the sidebar filters (threshold, years, date range, artists) to the
+    cleaned DataFrame. The DataFrame itself is not hashed; data_key identifies
+    the upload it came from, so reruns with unchanged filters hit the cache.
+    """
+    # All predicates are combined into one mask so the frame is copied only once
+    df = _df
+    mask = np.ones(len(df), dtype=bool)
+    if 'ms_played' in df.columns:
+        mask &= df['ms_played'].to_numpy() >= threshold_ms
+    if 'ts' in df.columns:
+        if selected_years:
+            mask &= np.isin(df['year'].to_numpy(), selected_years)
+        if start_date is not None and end_date is not None:
+            ts = df['ts'].to_numpy()
+            mask &= (ts >= np.datetime64(start_date)) & (ts <= np.datetime64(end_date))
+    if selected_artists and 'artist_name' in df.columns:
+        in_selected = df['artist_name'].isin(selected_artists).to_numpy()
+        mask &= in_selected if filter_mode == "Include" else ~in_selected
+    return df.loc[mask]
+
+def plain_labels(df, columns):
+    """
+    Casts categorical label columns of an aggregate back to plain objects.
+    A category column carries every category of the full history with it,
+    so displaying even a 10-row slice would send all of them to the browser.
+    """
+    return df.astype({col: object for col in columns})
+
+@st.cache_data(show_spinner=False, max_entries=8, ttl=3600)
+def build_summaries(_df, filter_key):
+    """
+    Computes the aggregates every dashboard section draws from, in one place:
+    by_track, by_artist, by_album, album_tracks, by_month_artist and
+    hour_dow_matrix (minutes per hour x day of week). Sections only slice
+    these, so the filtered DataFrame is scanned once per filter state.
+    Like filter_data, the DataFrame is not hashed; filter_key is the tuple
+    of filter arguments that produced it.
+    """
+    df = _df
+    columns = set(df.columns)
+    summaries = {}
+    if 'track_name' in columns:
+        summaries['by_track'] = track_play_stats(df)
+    if {'artist_name', 'ms_played'} <= columns:
+        artist_counts = fast_counts(df['artist_name'])
+        by_artist = pd.DataFrame({
+            'artist_name': artist_counts.index,
+            'count': artist_counts.to_numpy(),
+            'total_ms_played': fast_counts(df['artist_name'], df['ms_played']).to_numpy()
+        })
+        by_artist = by_artist[by_artist['count'] > 0]
+        by_artist['total_minutes'] = by_artist['total_ms_played'] / 60000.0
+        summaries['by_artist'] = by_artist
+    if {'album_name', 'track_name', 'artist_name'} <= columns:
+        by_album = df.groupby('album_name', sort=False, observed=True).agg(
+            count=('album_name', 'count'),
+            artist=('artist_name', 'first')
+        ).reset_index()
+        summaries['by_album'] = plain_labels(by_album, ['album_name', 'artist'])
+        album_tracks = df.groupby(['album_name', 'track_name'], observed=True, sort=False).size().rename('count').reset_index()
+        summaries['album_tracks'] = plain_labels(album_tracks, ['album_name', 'track_name'])
+    if {'year_month', 'artist_name', 'ms_played', 'track_name'} <= columns:
+        by_month_artist = df.groupby(['year_month', 'artist_name'], sort=False, observed=True).agg(
+            total_ms_played=('ms_played', 'sum'),
+            song_count=('track_name', 'count')
+        ).reset_index()
+        summaries['by_month_artist'] = plain_labels(by_month_artist, ['artist_name'])
+    if {'hour', 'day_of_week', 'ms_played'} <= columns:
+        # Summed directly on the int hour and day-of-week codes
+        hour_dow_matrix = np.zeros((24, 7), dtype=np.float64)
+        np.add.at(
+            hour_dow_matrix,
+            (df['hour'].to_numpy(), df['day_of_week'].cat.codes.to_numpy()),
+            df['ms_played'].to_numpy()
+        )
+        summaries['hour_dow_matrix'] = hour_dow_matrix / 60000.0
+    return summaries
+
+def top10_bar_chart(data, label_col, value_col, label_title, value_title):
+    """
+    Horizontal bar chart of a top-10 table, largest value on top.
+    Rendered by the browser (Vega-Lite) instead of rasterized by matplotlib.
+    """
+    return alt.Chart(data).mark_bar(color='#1DB954').encode(
+        x=alt.X(f"{value_col}:Q", title=value_title, axis=alt.Axis(tickMinStep=1, format='d')),
+        y=alt.Y(f"{label_col}:N", title=label_title, sort='-x')
+    )
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def heatmap_png(heatmap_matrix):
+    """
+    Renders the hour/day heatmap and returns it as PNG bytes. Keyed on the
+    matrix, so reruns that don't change it (e.g. unrelated widget changes)
+    skip both building and rasterizing the figure.
+    """
+    fig, ax = plt.subplots(figsize=(8, 6))
+    fig.patch.set_facecolor('#0E1117')
+    ax.set_facecolor('#0E1117')
+    cmap = LinearSegmentedColormap.from_list("custom_green_white", ["#FFFFFF", "#1DB954"], N=256)
+    # One image for the 24x7 grid instead of a patch per cell
+    im = ax.imshow(heatmap_matrix, aspect='auto', cmap=cmap, interpolation='nearest')
+    ax.set_xticks(range(len(DAY_ORDER)))
+    ax.set_xticklabels(DAY_ORDER)
+    ax.set_yticks(range(heatmap_matrix.shape[0]))
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.grid(False)
+    colorbar = fig.colorbar(im, ax=ax)
+    colorbar.outline.set_visible(False)
+    colorbar.ax.yaxis.set_tick_params(colors='white')
+    colorbar.set_label('Minutes Played', color='white')
+    ax.set_title("Heatmap: Daily Listening by Hour and Day", color='white', pad=10)
+    ax.set_xlabel("Day of Week", color='white')
+    ax.set_ylabel("Hour of Day", color='white')
+    ax.tick_params(axis='x', colors='white', rotation=45)
+    ax.tick_params(axis='y', colors='white')
+    # Same output settings st.pyplot uses
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
+
 def main():
     st.title("My Personalized Spotify Wrapped Dashboard")
     
@@ -50,8 +179,9 @@ def main():
         return
     else:
         file_bytes = uploaded_zip.read()
-        df = load_data_from_zip(file_bytes)
-        if df.empty:
+        data_key = hashlib.sha1(file_bytes).hexdigest()
+        raw_df = load_data_from_zip(file_bytes)
+        if raw_df.empty:
             st.error("The uploaded ZIP file did not contain any valid JSON data.")
             return
 
@@ -62,34 +192,30 @@ def main():
     # Filter 2.1: Playback Threshold
     threshold_seconds = st.sidebar.number_input("Ignore plays under (seconds)", min_value=0, value=20)
     threshold_ms = threshold_seconds * 1000
-    if 'ms_played' in df.columns:
-        df = df[df['ms_played'] >= threshold_ms]
+    df = filter_data(raw_df, data_key, threshold_ms)
 
     # Filter 2.2: Year Filters and Custom Date Range
+    selected_years = []
+    start_date = end_date = None
     if 'ts' in df.columns:
-        # Ensure the 'ts' column is tz-naive
-        if pd.api.types.is_datetime64tz_dtype(df['ts']):
-            df['ts'] = df['ts'].dt.tz_convert(None)
-        df['year'] = df['ts'].dt.year
         unique_years = sorted(df['year'].dropna().unique())
         st.sidebar.subheader("Year Filters")
-        selected_years = []
         for y in unique_years:
             if st.sidebar.checkbox(str(y), value=True):
                 selected_years.append(y)
-        if selected_years:
-            df = df[df['year'].isin(selected_years)]
-            
+        df = filter_data(raw_df, data_key, threshold_ms, tuple(selected_years))
+
         st.sidebar.subheader("Custom Date Range")
         min_date = df['ts'].min().date()
         max_date = df['ts'].max().date()
         start_date = st.sidebar.date_input("Start Date", min_date)
         end_date = st.sidebar.date_input("End Date", max_date)
-        df = df[(df['ts'] >= pd.to_datetime(start_date)) & (df['ts'] <= pd.to_datetime(end_date))]
+        df = filter_data(raw_df, data_key, threshold_ms, tuple(selected_years), start_date, end_date)
     else:
         st.sidebar.write("Timestamp column not found.")
 
     # Filter 2.3: Artist Filter Mode and Selection
+    selected_artists = []
     st.sidebar.subheader("Artist Filter Mode")
     filter_mode = st.sidebar.radio("Select Mode", ["Include", "Exclude"], index=0)
     if 'artist_name' in df.columns:
@@ -97,10 +223,8 @@ def main():
         st.sidebar.subheader("Artist Filter")
         selected_artists = st.sidebar.multiselect("Select Artists", unique_artists)
         if selected_artists:
-            if filter_mode == "Include":
-                df = df[df['artist_name'].isin(selected_artists)]
-            else:
-                df = df[~df['artist_name'].isin(selected_artists)]
+            df = filter_data(raw_df, data_key, threshold_ms, tuple(selected_years), start_date, end_date,
+                             tuple(selected_artists), filter_mode)
     else:
         st.sidebar.write("Artist column not found.")
 
@@ -110,7 +234,8 @@ def main():
     st.write(f"Total records: {len(df):,}")
     private_cols = ['ip_addr', 'offline_timestamp']
     display_df = df.drop(columns=[col for col in private_cols if col in df.columns], errors='ignore')
-    st.write(display_df.head())
+    preview_df = display_df.head()
+    st.write(plain_labels(preview_df, preview_df.select_dtypes('category').columns))
 
     # 4. Overall Listening Stats
     # ----------------------------
@@ -121,41 +246,25 @@ def main():
     else:
         st.write("Column 'ms_played' not found.")
 
+    # Aggregates shared by all sections below, cached per filter state
+    filter_key = (data_key, threshold_ms, tuple(selected_years), start_date, end_date,
+                  tuple(selected_artists), filter_mode)
+    summaries = build_summaries(df, filter_key)
+
     # 5. Top 10 Songs by Playback Count
     # ----------------------------------
     st.subheader("Top 10 Songs by Playback Count")
     if 'track_name' in df.columns:
-        top_tracks_count = df['track_name'].value_counts().head(10)
-        if 'artist_name' in df.columns and 'album_name' in df.columns:
-            artist_album_map = df.groupby('track_name').agg({
-                'artist_name': 'first',
-                'album_name': 'first'
-            })
-        else:
-            artist_album_map = pd.DataFrame(index=top_tracks_count.index)
-            artist_album_map['artist_name'] = ''
-            artist_album_map['album_name'] = ''
-        top_songs_df = top_tracks_count.reset_index()
-        top_songs_df.columns = ['track_name', 'count']
-        top_songs_df = top_songs_df.join(artist_album_map, on='track_name')
-        top_songs_df = top_songs_df.reset_index(drop=True)
+        top_songs_df = top_k(summaries['by_track'], 'total_plays', ascending=False)
+        top_songs_df = top_songs_df.rename(columns={'total_plays': 'count'})
+        for col in ('artist_name', 'album_name'):
+            if col not in top_songs_df.columns:
+                top_songs_df[col] = ''
+        top_songs_df = top_songs_df[['track_name', 'count', 'artist_name', 'album_name']].reset_index(drop=True)
         st.table(top_songs_df)
 
         st.subheader("Bar Chart of Top 10 Songs by Count")
-        sorted_tracks = top_songs_df.sort_values('count', ascending=False).iloc[::-1]
-        fig, ax = plt.subplots(figsize=(6, 4))
-        fig.patch.set_facecolor('#0E1117')
-        ax.set_facecolor('#0E1117')
-        ax.barh(sorted_tracks['track_name'], sorted_tracks['count'], color='#1DB954', edgecolor='none')
-        ax.set_title("Top 10 Songs by Count", color='white', pad=10)
-        ax.set_xlabel("Count", color='white')
-        ax.set_ylabel("Track Name", color='white')
-        ax.tick_params(axis='x', colors='white')
-        ax.tick_params(axis='y', colors='white')
-        for spine in ax.spines.values():
-            spine.set_visible(False)
-        ax.grid(False)
-        st.pyplot(fig)
+        st.altair_chart(top10_bar_chart(top_songs_df, 'track_name', 'count', "Track Name", "Count"), use_container_width=True)
     else:
         st.write("Column 'track_name' not found.")
 
@@ -163,32 +272,13 @@ def main():
     # ------------------------------------
     st.subheader("Top 10 Artists by Playback Count")
     if 'artist_name' in df.columns and 'ms_played' in df.columns:
-        artist_stats = df.groupby('artist_name').agg(
-            count=('artist_name', 'count'),
-            total_ms_played=('ms_played', 'sum')
-        ).reset_index()
-        artist_stats['total_minutes'] = artist_stats['total_ms_played'] / 60000.0
-        top_artists_df = artist_stats.sort_values('count', ascending=False).head(10).reset_index(drop=True)
-        top_artists_df['count'] = top_artists_df['count'].apply(lambda x: f"{x:,}")
-        top_artists_df['total_minutes'] = top_artists_df['total_minutes'].apply(lambda x: f"{round(x):,}")
-        st.table(top_artists_df[['artist_name', 'count', 'total_minutes']])
+        top_artists = top_k(summaries['by_artist'], 'count', ascending=False)
+        top_artists_df = top_artists.reset_index(drop=True)
+        top_artists_df = top_artists_df[['artist_name', 'count', 'total_minutes']]
+        st.dataframe(top_artists_df.style.format({'count': '{:,}', 'total_minutes': '{:,.0f}'}))
 
         st.subheader("Bar Chart of Top 10 Artists by Count")
-        sorted_artists = artist_stats.sort_values('count', ascending=False).head(10).iloc[::-1]
-        fig, ax = plt.subplots(figsize=(6, 4))
-        fig.patch.set_facecolor('#0E1117')
-        ax.set_facecolor('#0E1117')
-        ax.barh(sorted_artists['artist_name'], sorted_artists['count'], color='#1DB954', edgecolor='none')
-        ax.set_title("Top 10 Artists by Count", color='white', pad=10)
-        ax.set_xlabel("Count", color='white')
-        ax.set_ylabel("Artist Name", color='white')
-        ax.tick_params(axis='x', colors='white')
-        ax.tick_params(axis='y', colors='white')
-        for spine in ax.spines.values():
-            spine.set_visible(False)
-        ax.grid(False)
-        ax.xaxis.set_major_locator(plt.MaxNLocator(integer=True))
-        st.pyplot(fig)
+        st.altair_chart(top10_bar_chart(top_artists, 'artist_name', 'count', "Artist Name", "Count"), use_container_width=True)
     else:
         st.write("Column 'artist_name' not found.")
 
@@ -196,21 +286,18 @@ def main():
     # -----------------------------------------
     st.subheader("Top 10 Albums by Playback Count (Expandable)")
     if 'album_name' in df.columns and 'track_name' in df.columns and 'artist_name' in df.columns:
-        album_stats = df.groupby('album_name').agg(
-            count=('album_name', 'count'),
-            artist=('artist_name', 'first')
-        ).reset_index()
-        top_albums = album_stats.sort_values('count', ascending=False).head(10)
+        top_albums = top_k(summaries['by_album'], 'count', ascending=False)
+        album_track = summaries['album_tracks']
+        album_track = album_track[album_track['album_name'].isin(top_albums['album_name'])]
+        tracks_by_album = {album: tracks for album, tracks in album_track.groupby('album_name', observed=True, sort=False)}
         for _, row in top_albums.iterrows():
             album = row['album_name']
             count = row['count']
             artist = row['artist']
             expander_label = f"{artist} - {album} — {count:,} plays"
             with st.expander(expander_label):
-                album_df = df[df['album_name'] == album]
-                track_counts = album_df['track_name'].value_counts()
-                track_counts_df = track_counts.reset_index()
-                track_counts_df.columns = ['track_name', 'count']
+                track_counts_df = tracks_by_album[album][['track_name', 'count']]
+                track_counts_df = track_counts_df.sort_values('count', ascending=False).reset_index(drop=True)
                 st.table(track_counts_df)
     else:
         st.write("Required columns ('album_name', 'track_name', 'artist_name') not found.")
@@ -219,48 +306,33 @@ def main():
     # -----------------------------------------
     st.subheader("Most and Least Skipped Songs Analysis")
     if 'track_name' in df.columns and 'skipped' in df.columns:
-        track_skip_stats = df.groupby('track_name').agg(
-            total_plays=('track_name', 'count'),
-            total_skips=('skipped', 'sum')
-        ).reset_index()
+        track_skip_stats = summaries['by_track'].copy()
         track_skip_stats['skip_rate'] = track_skip_stats['total_skips'] / track_skip_stats['total_plays']
         track_skip_stats = track_skip_stats[track_skip_stats['total_plays'] >= 5]
         
-        most_skipped = track_skip_stats.sort_values(['skip_rate', 'total_plays'], ascending=[False, False]).head(10).reset_index(drop=True)
-        least_skipped = track_skip_stats.sort_values(['skip_rate', 'total_plays'], ascending=[True, False]).head(10).reset_index(drop=True)
-        
-        if 'artist_name' in df.columns:
-            artist_map = df.groupby('track_name')['artist_name'].first().reset_index()
-            most_skipped = most_skipped.merge(artist_map, on='track_name', how='left')
-            least_skipped = least_skipped.merge(artist_map, on='track_name', how='left')
+        most_skipped = top_k(track_skip_stats, ['skip_rate', 'total_plays'], ascending=[False, False]).reset_index(drop=True)
+        least_skipped = top_k(track_skip_stats, ['skip_rate', 'total_plays'], ascending=[True, False]).reset_index(drop=True)
         
         most_skipped = most_skipped[['artist_name', 'track_name', 'total_plays', 'total_skips', 'skip_rate']]
         least_skipped = least_skipped[['artist_name', 'track_name', 'total_plays', 'total_skips', 'skip_rate']]
-        
-        most_skipped['skip_rate'] = most_skipped['skip_rate'].apply(lambda x: f"{x:.2%}")
-        least_skipped['skip_rate'] = least_skipped['skip_rate'].apply(lambda x: f"{x:.2%}")
-        most_skipped['total_plays'] = most_skipped['total_plays'].apply(lambda x: f"{x:,}")
-        least_skipped['total_plays'] = least_skipped['total_plays'].apply(lambda x: f"{x:,}")
+        skip_format = {'total_plays': '{:,}', 'skip_rate': '{:.2%}'}
         
         st.subheader("Top 10 Most Skipped Songs (by Skip Rate & Total Plays)")
-        st.table(most_skipped.reset_index(drop=True))
+        st.dataframe(most_skipped.style.format(skip_format))
         
         st.subheader("Top 10 Least Skipped Songs (by Skip Rate & Total Plays)")
-        st.table(least_skipped.reset_index(drop=True))
+        st.dataframe(least_skipped.style.format(skip_format))
     else:
         st.write("Columns 'track_name' or 'skipped' not found.")
 
     # 9. Monthly Top Artist Analysis
     # ------------------------------
     st.subheader("Monthly Top Artist Analysis")
-    if 'artist_name' in df.columns and 'ms_played' in df.columns and 'track_name' in df.columns:
-        df['year_month'] = df['ts'].dt.to_period('M')
-        monthly_artist = df.groupby(['year_month', 'artist_name']).agg(
-            total_ms_played=('ms_played', 'sum'),
-            song_count=('track_name', 'count')
-        ).reset_index()
-        monthly_top = monthly_artist.sort_values(['year_month', 'total_ms_played'], ascending=[True, False]).drop_duplicates(subset=['year_month'], keep='first')
-        top_artist_months = monthly_top.groupby('artist_name').agg(
+    if 'artist_name' in df.columns and 'ms_played' in df.columns and 'track_name' in df.columns and 'year_month' in df.columns:
+        monthly_artist = summaries['by_month_artist']
+        top_idx = monthly_artist.groupby('year_month', sort=False, observed=True)['total_ms_played'].idxmax()
+        monthly_top = monthly_artist.loc[top_idx]
+        top_artist_months = monthly_top.groupby('artist_name', observed=True).agg(
             months_as_top=('year_month', 'count'),
             total_ms_played=('total_ms_played', 'sum'),
             total_song_count=('song_count', 'sum')
@@ -272,33 +344,19 @@ def main():
         st.table(top_artist_months[['artist_name', 'months_as_top', 'total_song_count', 'total_minutes']])
         
         st.subheader("Bar Chart: Top Artists by Months as Top")
-        sorted_top_artist = top_artist_months.sort_values('months_as_top', ascending=False).head(10).iloc[::-1]
-        fig, ax = plt.subplots(figsize=(6, 4))
-        fig.patch.set_facecolor('#0E1117')
-        ax.set_facecolor('#0E1117')
-        ax.barh(sorted_top_artist['artist_name'], sorted_top_artist['months_as_top'], color='#1DB954', edgecolor='none')
-        ax.set_title("Top Artists by Months as Top", color='white', pad=10)
-        ax.set_xlabel("Months as Top", color='white')
-        ax.set_ylabel("Artist Name", color='white')
-        ax.tick_params(axis='x', colors='white', labelsize=10)
-        ax.tick_params(axis='y', colors='white', labelsize=10)
-        for spine in ax.spines.values():
-            spine.set_visible(False)
-        ax.grid(False)
-        ax.xaxis.set_major_locator(plt.MaxNLocator(integer=True))
-        st.pyplot(fig)
+        st.altair_chart(top10_bar_chart(top_artist_months.head(10), 'artist_name', 'months_as_top', "Artist Name", "Months as Top"), use_container_width=True)
     else:
         st.write("Required columns for Monthly Top Artist Analysis not found.")
 
     # 10. Listening Analysis: Graphs
     # ------------------------------
     st.subheader("Listening Analysis")
+    # The hourly and daily charts are the row and column sums of the heatmap matrix
+    heatmap_matrix = summaries['hour_dow_matrix']
     
     # 10.1 Listening Time by Hour of Day
     st.subheader("Listening Time by Hour of Day")
-    df['hour'] = df['ts'].dt.hour
-    hourly_usage = df.groupby('hour')['ms_played'].sum() / 60000.0  # convert ms to minutes
-    hourly_usage = hourly_usage.reindex(range(24), fill_value=0)
+    hourly_usage = pd.Series(heatmap_matrix.sum(axis=1), index=range(24))
     fig, ax = plt.subplots(figsize=(6, 4))
     fig.patch.set_facecolor('#0E1117')
     ax.set_facecolor('#0E1117')
@@ -317,10 +375,7 @@ def main():
 
     # 10.2 Listening Time by Day of Week
     st.subheader("Listening Time by Day of Week")
-    df['day_of_week'] = df['ts'].dt.day_name()
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    dow_usage = df.groupby('day_of_week')['ms_played'].sum() / 60000.0
-    dow_usage = dow_usage.reindex(day_order, fill_value=0)
+    dow_usage = pd.Series(heatmap_matrix.sum(axis=0), index=DAY_ORDER)
     fig, ax = plt.subplots(figsize=(6, 4))
     fig.patch.set_facecolor('#0E1117')
     ax.set_facecolor('#0E1117')
@@ -338,37 +393,7 @@ def main():
 
     # 10.3 Heatmap: Daily Listening by Hour and Day
     st.subheader("Heatmap: Daily Listening by Hour and Day")
-    heatmap_df = df.copy()
-    heatmap_df['hour'] = heatmap_df['ts'].dt.hour
-    heatmap_df['day_of_week'] = heatmap_df['ts'].dt.day_name()
-    grouped = heatmap_df.groupby(['hour', 'day_of_week'])['ms_played'].sum().reset_index()
-    heatmap_pivot = grouped.pivot(index='hour', columns='day_of_week', values='ms_played') / 60000.0
-    heatmap_pivot = heatmap_pivot.reindex(columns=day_order)
-    min_minutes_played = heatmap_pivot.min().min()
-    heatmap_pivot = heatmap_pivot.fillna(min_minutes_played)
-    fig, ax = plt.subplots(figsize=(8, 6))
-    fig.patch.set_facecolor('#0E1117')
-    ax.set_facecolor('#0E1117')
-    cmap = LinearSegmentedColormap.from_list("custom_green_white", ["#FFFFFF", "#1DB954"], N=256)
-    sns_heatmap = sns.heatmap(
-        heatmap_pivot,
-        cmap=cmap,
-        annot=False,
-        fmt=".0f",
-        ax=ax,
-        linewidths=0,
-        linecolor='none',
-        cbar_kws={'label': 'Minutes Played'}
-    )
-    colorbar = ax.collections[0].colorbar
-    colorbar.ax.yaxis.set_tick_params(colors='white')
-    colorbar.set_label('Minutes Played', color='white')
-    ax.set_title("Heatmap: Daily Listening by Hour and Day", color='white', pad=10)
-    ax.set_xlabel("Day of Week", color='white')
-    ax.set_ylabel("Hour of Day", color='white')
-    ax.tick_params(axis='x', colors='white', rotation=45)
-    ax.tick_params(axis='y', colors='white')
-    st.pyplot(fig)
+    st.image(heatmap_png(heatmap_matrix), use_container_width=True)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,81 @@
+# src/aggregations.py
+
+import numpy as np
+import pandas as pd
+from numba import njit
+
+@njit(cache=True)
+def _track_counts(codes, skipped, n):
+    """
+    Single pass over the category codes of track_name, accumulating plays,
+    skips and the row of the first play for each track. Rows with a missing
+    track (code -1) are ignored.
+    """
+    plays = np.zeros(n, np.int64)
+    skips = np.zeros(n, np.int64)
+    first_row = np.full(n, -1, np.int64)
+    for i in range(codes.size):
+        c = codes[i]
+        if c < 0:
+            continue
+        plays[c] += 1
+        skips[c] += skipped[i]
+        if first_row[c] < 0:
+            first_row[c] = i
+    return plays, skips, first_row
+
+def track_play_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns one row per played track with total_plays, total_skips and the
+    artist_name/album_name of its first play (when those columns exist).
+    """
+    track_col = df['track_name'].astype('category')
+    codes = track_col.cat.codes.to_numpy()
+    if 'skipped' in df.columns:
+        skipped = df['skipped'].to_numpy(dtype=bool).view(np.uint8)
+    else:
+        skipped = np.zeros(len(df), dtype=np.uint8)
+    plays, skips, first_row = _track_counts(codes, skipped, len(track_col.cat.categories))
+
+    played = plays > 0
+    stats = pd.DataFrame({
+        'track_name': track_col.cat.categories[played],
+        'total_plays': plays[played],
+        'total_skips': skips[played]
+    })
+    for col in ('artist_name', 'album_name'):
+        if col in df.columns:
+            stats[col] = df[col].to_numpy()[first_row[played]]
+    return stats
+
+def fast_counts(cat_col: pd.Series, weights=None) -> pd.Series:
+    """
+    Row counts per category of a categorical column (or sums of weights when
+    given), computed with np.bincount on the category codes instead of
+    hashing the string values. Missing values are ignored and unobserved
+    categories come back as 0.
+    """
+    codes = cat_col.cat.codes.to_numpy()
+    present = codes >= 0
+    if weights is not None:
+        weights = np.asarray(weights)[present]
+    categories = cat_col.cat.categories
+    counts = np.bincount(codes[present], weights=weights, minlength=len(categories))
+    return pd.Series(counts, index=categories)
+
+def top_k(df: pd.DataFrame, by, k=10, ascending=True) -> pd.DataFrame:
+    """
+    Equivalent to df.sort_values(by, ascending=ascending).head(k), but only
+    sorts the rows that can make the top k. Rows are first narrowed with
+    np.partition on the primary key (keeping ties at the cutoff), so the
+    cost is linear in len(df) instead of a full sort.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    ascending = [ascending] * len(by) if isinstance(ascending, bool) else list(ascending)
+    if len(df) > k:
+        primary = df[by[0]].to_numpy()
+        if not ascending[0]:
+            primary = -primary
+        kth = np.partition(primary, k - 1)[k - 1]
+        df = df[primary <= kth]
+    return df.sort_values(by, ascending=ascending).head(k)
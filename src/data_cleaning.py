@@ -3,13 +3,27 @@
 import os
 import pandas as pd
 
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Repeated string columns that are stored as categories
+CATEGORY_COLUMNS = [
+    'track_name',
+    'artist_name',
+    'album_name',
+    'platform',
+    'conn_country',
+    'reason_start',
+    'reason_end'
+]
+
 def clean_spotify_df(df: pd.DataFrame) -> pd.DataFrame:
     """
     Cleans and transforms the streaming history DataFrame.
     - Renames columns.
     - Converts timestamps.
-    - Adds new columns (e.g., hour, day_of_week, minutes_played).
+    - Adds new columns (e.g., hour, day_of_week, year, year_month, minutes_played).
     - Drops unnecessary columns.
+    - Downcasts dtypes (categories for repeated strings, smaller ints).
     """
     print("Original columns:", df.columns.tolist())
     
@@ -24,13 +38,25 @@ def clean_spotify_df(df: pd.DataFrame) -> pd.DataFrame:
     
     # Convert timestamps and add time-based columns
     if 'ts' in df.columns:
-        df['ts'] = pd.to_datetime(df['ts'], errors='coerce')
-        df['hour'] = df['ts'].dt.hour
-        df['day_of_week'] = df['ts'].dt.day_name()
+        # Extended history timestamps are fixed-format UTC, so skip format inference
+        # and store them tz-naive (in UTC) for direct comparison with date inputs
+        raw_ts = df['ts']
+        ts = pd.to_datetime(raw_ts, format='%Y-%m-%dT%H:%M:%SZ', utc=True, cache=True, errors='coerce')
+        # Other layouts (e.g. ts re-read from a cleaned CSV) mostly fail the strict
+        # format; parse those with inference instead of dropping them as NaT
+        if ts.isna().sum() > raw_ts.notna().sum() / 2:
+            ts = pd.to_datetime(raw_ts, utc=True, cache=True, errors='coerce')
+        df['ts'] = ts.dt.tz_localize(None)
     elif 'endTime' in df.columns:
         df['ts'] = pd.to_datetime(df['endTime'], errors='coerce')
-        df['hour'] = df['ts'].dt.hour
-        df['day_of_week'] = df['ts'].dt.day_name()
+    if 'ts' in df.columns:
+        # Rows without a valid timestamp can't be placed in any time-based view
+        df.dropna(subset=['ts'], inplace=True)
+        df['hour'] = df['ts'].dt.hour.astype('int8')
+        df['day_of_week'] = pd.Categorical(df['ts'].dt.day_name(), categories=DAY_ORDER, ordered=True)
+        df['year'] = df['ts'].dt.year.astype('int16')
+        # First instant of the calendar month, a cheap datetime key for monthly grouping
+        df['year_month'] = df['ts'].to_numpy().astype('datetime64[M]').astype('datetime64[ns]')
 
     # Create a new column for minutes played (if ms_played exists)
     if 'ms_played' in df.columns:
@@ -47,7 +73,18 @@ def clean_spotify_df(df: pd.DataFrame) -> pd.DataFrame:
         "audiobook_chapter_title"
     ]
     df.drop(columns=columns_to_drop, inplace=True, errors="ignore")
-    
+
+    # Downcast dtypes to cut memory for the dashboard's groupbys
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    if 'ms_played' in df.columns:
+        df['ms_played'] = df['ms_played'].astype('int32')
+    if 'minutes_played' in df.columns:
+        df['minutes_played'] = df['minutes_played'].astype('float32')
+    if 'skipped' in df.columns:
+        df['skipped'] = df['skipped'].fillna(False).astype('bool')
+
     print("Cleaned columns:", df.columns.tolist())
     return df
 
@@ -1,8 +1,38 @@
 import os
-import json
+import time
+import hashlib
+import tempfile
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 import zipfile
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+# Parsed uploads are cached here as Parquet, keyed on the SHA-1 of the ZIP bytes.
+# Opt-in for local runs (e.g. SPOTIFY_WRAPPED_CACHE_DIR=~/.cache/spotify_wrapped);
+# when unset nothing is written to disk, so a hosted app keeps no listening history.
+CACHE_DIR = os.environ.get("SPOTIFY_WRAPPED_CACHE_DIR")
+
+# Only the most recently used cache files are kept
+CACHE_MAX_FILES = 8
+
+# The only raw columns the dashboard uses; everything else is dropped on load
+CACHE_COLUMNS = [
+    'ts',
+    'ms_played',
+    'master_metadata_track_name',
+    'master_metadata_album_artist_name',
+    'master_metadata_album_album_name',
+    'skipped'
+]
+
+# Explicit dtypes for the numeric/boolean raw columns (ts is parsed in cleaning)
+INGEST_DTYPES = {
+    'ms_played': 'int32',
+    'skipped': 'bool'
+}
 
 def load_streaming_history(data_folder="../data"):
     """
@@ -11,39 +41,123 @@ def load_streaming_history(data_folder="../data"):
     This function is maintained for backward compatibility and local testing,
     but is not used in the deployed app.
     """
-    all_dfs = []
+    all_records = []
     for filename in os.listdir(data_folder):
         if filename.endswith(".json"):
             filepath = os.path.join(data_folder, filename)
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            df = pd.json_normalize(data)
-            all_dfs.append(df)
-    if all_dfs:
-        combined_df = pd.concat(all_dfs, ignore_index=True)
-        return combined_df
-    else:
-        return pd.DataFrame()
+            with open(filepath, "rb") as f:
+                all_records.extend(orjson.loads(f.read()))
+    return _records_to_df(all_records)
 
-def ingest_spotify_zip(zip_file_bytes: bytes) -> pd.DataFrame:
+def ingest_spotify_zip(zip_file_bytes: bytes, cache_dir=CACHE_DIR) -> pd.DataFrame:
     """
     Ingests a ZIP file (provided as bytes) containing one or more
     Spotify Streaming History JSON files and returns a combined DataFrame.
     This is the function used in the deployed app.
+
+    When cache_dir is set, extended streaming history exports are written to
+    a Parquet file there on first ingestion, so later uploads of the same ZIP
+    skip the JSON parsing and only load CACHE_COLUMNS.
+    """
+    cache_path = None
+    if cache_dir:
+        digest = hashlib.sha1(zip_file_bytes).hexdigest()
+        cache_path = os.path.join(cache_dir, f"{digest}.parquet")
+        cached_df = _read_cache(cache_path)
+        if cached_df is not None:
+            return cached_df
+
+    combined_df = _read_zip_json(zip_file_bytes)
+    if set(CACHE_COLUMNS).issubset(combined_df.columns):
+        combined_df = combined_df[CACHE_COLUMNS]
+        if cache_path:
+            _write_cache(combined_df, cache_path)
+    return combined_df
+
+def _read_cache(cache_path):
+    """
+    Returns the cached DataFrame, or None on a cache miss. A file that can't
+    be read as Parquet counts as a miss, so the ZIP is parsed and the cache
+    rewritten.
+    """
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        # Project columns at scan time and keep them Arrow-backed (no object copies)
+        dataset = ds.dataset(cache_path, format='parquet')
+        df = dataset.to_table(columns=CACHE_COLUMNS).to_pandas(types_mapper=pd.ArrowDtype)
+        # Mark as recently used for eviction
+        os.utime(cache_path)
+    except (pa.ArrowException, OSError) as e:
+        print(f"Ignoring unreadable Parquet cache {cache_path}: {e}")
+        return None
+    return df
+
+def _write_cache(df, cache_path):
     """
+    Writes df to cache_path atomically: the Parquet file is written to a
+    temporary file in the same directory and moved into place, so a failed
+    or interrupted write never leaves a partial cache file behind.
+    """
+    cache_dir = os.path.dirname(cache_path)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=cache_dir)
+        with os.fdopen(fd, 'wb') as f:
+            df.to_parquet(f, compression='zstd')
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write Parquet cache {cache_path}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    _evict_cache(cache_dir)
+
+def _evict_cache(cache_dir, max_files=CACHE_MAX_FILES):
+    """
+    Deletes all but the max_files most recently used cache files, plus
+    temporary files left over from interrupted writes more than an hour ago.
+    """
+    try:
+        entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)]
+        cache_files = sorted(
+            (path for path in entries if path.endswith('.parquet')),
+            key=os.path.getmtime,
+            reverse=True
+        )
+        stale_tmp = [path for path in entries
+                     if path.endswith('.tmp') and os.path.getmtime(path) < time.time() - 3600]
+        for path in cache_files[max_files:] + stale_tmp:
+            os.remove(path)
+    except OSError as e:
+        print(f"Could not evict Parquet cache entries in {cache_dir}: {e}")
+
+def _read_zip_json(zip_file_bytes: bytes) -> pd.DataFrame:
+    """
+    Parses every JSON file in the ZIP and returns them as a single DataFrame.
+    """
+    # Streaming history records are flat, so they go straight into one
+    # DataFrame without json_normalize or a per-file concat
     with zipfile.ZipFile(BytesIO(zip_file_bytes), 'r') as z:
-        all_dfs = []
-        for filename in z.namelist():
-            if filename.lower().endswith('.json'):
-                with z.open(filename) as f:
-                    data = json.load(f)
-                df = pd.json_normalize(data)
-                all_dfs.append(df)
-        if all_dfs:
-            combined_df = pd.concat(all_dfs, ignore_index=True)
-            return combined_df
-        else:
+        json_names = [name for name in z.namelist() if name.lower().endswith('.json')]
+        if not json_names:
             return pd.DataFrame()
+        # Entries are decompressed and parsed concurrently; map keeps file order
+        with ThreadPoolExecutor(max_workers=min(8, len(json_names))) as executor:
+            chunks = list(executor.map(lambda name: orjson.loads(z.read(name)), json_names))
+    return _records_to_df([record for chunk in chunks for record in chunk])
+
+def _records_to_df(all_records) -> pd.DataFrame:
+    """
+    Builds a single DataFrame from parsed streaming history records and
+    applies INGEST_DTYPES.
+    """
+    if not all_records:
+        return pd.DataFrame()
+    df = pd.DataFrame.from_records(all_records)
+    dtypes = {col: dtype for col, dtype in INGEST_DTYPES.items() if col in df.columns}
+    return df.astype(dtypes, copy=False)
 
 def main():
     """